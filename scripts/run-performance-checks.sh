@@ -115,8 +115,8 @@ for endpoint_name in "${!ENDPOINTS[@]}"; do
     fi
 done
 
-# Calculate overall p95
-ALL_LATENCIES=$(jq -r '[.[].latencies[]] | sort | .[8]' "$LATENCY_RESULTS")
+# Calculate overall p95 across all samples (numeric sort, same rank as above)
+ALL_LATENCIES=$(jq -r '[.[].latencies[] | tonumber] | sort | .[(length * 0.95 | floor) - 1]' "$LATENCY_RESULTS")
 OVERALL_P95_MS=$(echo "$ALL_LATENCIES * 1000" | bc)
 
 if [ "$LATENCY_FAILED" = false ]; then
@@ -266,22 +266,21 @@ echo -e "${GREEN}Performance Gates Summary${NC}"
 echo -e "${GREEN}========================================${NC}"
 echo ""
 
-TOTAL_METRICS=$(jq '.metrics | length' "$PERF_REPORT")
-PASSED_METRICS=$(jq '[.metrics[] | select(.status == "PASS")] | length' "$PERF_REPORT")
-FAILED_METRICS=$(jq '[.metrics[] | select(.status == "FAIL")] | length' "$PERF_REPORT")
+# Tally all metrics in a single pass and store the summary
+jq '.summary = (reduce .metrics[] as $m ({total: 0, passed: 0, failed: 0};
+      .total += 1
+      | if $m.status == "PASS" then .passed += 1
+        elif $m.status == "FAIL" then .failed += 1
+        else . end))' \
+   "$PERF_REPORT" > "$PERF_REPORT.tmp" && mv "$PERF_REPORT.tmp" "$PERF_REPORT"
+
+read -r TOTAL_METRICS PASSED_METRICS FAILED_METRICS < <(jq -r '.summary | "\(.total) \(.passed) \(.failed)"' "$PERF_REPORT")
 
 echo "Total Metrics: $TOTAL_METRICS"
 echo -e "${GREEN}Passed: $PASSED_METRICS${NC}"
 echo -e "${RED}Failed: $FAILED_METRICS${NC}"
 echo ""
 
-# Update summary
-jq --argjson total "$TOTAL_METRICS" \
-   --argjson passed "$PASSED_METRICS" \
-   --argjson failed "$FAILED_METRICS" \
-   '.summary = {total: $total, passed: $passed, failed: $failed}' \
-   "$PERF_REPORT" > "$PERF_REPORT.tmp" && mv "$PERF_REPORT.tmp" "$PERF_REPORT"
-
 echo "Full report: $PERF_REPORT"
 echo ""
 
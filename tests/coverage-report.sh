@@ -179,16 +179,19 @@ echo "⚡ Running performance tests..."
 
 # Check if k6 is available
 if command -v k6 &> /dev/null; then
+  # Raw samples are NDJSON; the .gz suffix makes k6 gzip them as it streams
   # Slice A performance test
   k6 run \
-    --out json="${REPORT_DIR}/slice-a-perf.json" \
-    tests/Performance/slice-a-load-test.js \
+    --out json="${REPORT_DIR}/slice-a-perf.json.gz" \
+    -e REPORT_DIR="${REPORT_DIR}" \
+    tests/performance/slice-a-load-test.js \
     || PERFORMANCE_RESULT=1
 
   # Slice B performance test
   k6 run \
-    --out json="${REPORT_DIR}/slice-b-perf.json" \
-    tests/Performance/slice-b-load-test.js \
+    --out json="${REPORT_DIR}/slice-b-perf.json.gz" \
+    -e REPORT_DIR="${REPORT_DIR}" \
+    tests/performance/slice-b-load-test.js \
     || PERFORMANCE_RESULT=1
 
   if [ $PERFORMANCE_RESULT -eq 0 ]; then
@@ -0,0 +1,72 @@
+import http from 'k6/http';
+import { sleep } from 'k6';
+
+// Shared configuration for the slice load tests
+export const BASE_URL = __ENV.BASE_URL || 'https://dev.onboarding.local';
+
+// Directory handleSummary writes the JSON summaries to
+export const REPORT_DIR = __ENV.REPORT_DIR || 'tests/performance/reports';
+
+// Endpoints hit by more than one slice
+export const REGISTER_URL = `${BASE_URL}/api/auth/register`;
+export const POINTS_HISTORY_URL = `${BASE_URL}/api/gamification/points/history`;
+
+// Optional open-model pacing: when set, k6 starts ARRIVAL_RATE iterations per
+// second regardless of response time instead of looping VUs with think time
+export const ARRIVAL_RATE = Number(__ENV.ARRIVAL_RATE) || 0;
+export const ARRIVAL_DURATION = __ENV.ARRIVAL_DURATION || '10m';
+
+// Client options common to every slice
+export const CLIENT_OPTIONS = {
+  // Percentiles are computed by k6's Trend sinks; no post-processing needed
+  summaryTrendStats: ['avg', 'min', 'med', 'max', 'p(95)', 'p(99)'],
+  // Reuse keep-alive connections across iterations and cache DNS lookups so
+  // latency reflects the API, not TCP/TLS handshakes
+  noConnectionReuse: false,
+  noVUConnectionReuse: false,
+  dns: { ttl: '5m', select: 'roundRobin' },
+};
+
+// Staged VU profile by default; constant arrival rate when ARRIVAL_RATE is set
+export function loadProfile(stages, peakVUs) {
+  if (ARRIVAL_RATE > 0) {
+    return {
+      scenarios: {
+        arrival_rate: {
+          executor: 'constant-arrival-rate',
+          rate: ARRIVAL_RATE,
+          timeUnit: '1s',
+          duration: ARRIVAL_DURATION,
+          preAllocatedVUs: peakVUs,
+          maxVUs: peakVUs * 2,
+        },
+      },
+    };
+  }
+
+  return { stages: stages };
+}
+
+// Think time between iterations (arrival-rate mode paces iterations itself)
+export function thinkTime(minSeconds, maxSeconds) {
+  if (!ARRIVAL_RATE) {
+    sleep(Math.random() * (maxSeconds - minSeconds) + minSeconds);
+  }
+}
+
+// Parse a JSON response body once; null when the body is not valid JSON
+export function parseJson(res) {
+  try {
+    return JSON.parse(res.body);
+  } catch (e) {
+    return null;
+  }
+}
+
+// Fail fast if the API is not ready
+export function checkHealth() {
+  const healthRes = http.get(`${BASE_URL}/api/health`, { responseType: 'none' });
+  if (healthRes.status !== 200) {
+    throw new Error('Health check failed - API is not ready');
+  }
+}
@@ -2,6 +2,19 @@ import http from 'k6/http';
 import { check, sleep, group } from 'k6';
 import { Rate, Trend, Counter } from 'k6/metrics';
 import { randomString } from 'https://jslib.k6.io/k6-utils/1.2.0/index.js';
+import {
+  BASE_URL,
+  REPORT_DIR,
+  REGISTER_URL,
+  POINTS_HISTORY_URL,
+  ARRIVAL_RATE,
+  ARRIVAL_DURATION,
+  CLIENT_OPTIONS,
+  loadProfile,
+  thinkTime,
+  parseJson,
+  checkHealth,
+} from './common.js';
 
 // Custom metrics
 const errorRate = new Rate('errors');
@@ -10,19 +23,34 @@ const verificationDuration = new Trend('verification_duration');
 const pointsAwardDuration = new Trend('points_award_duration');
 const successfulRegistrations = new Counter('successful_registrations');
 
-// Configuration
-const BASE_URL = __ENV.BASE_URL || 'https://dev.onboarding.local';
+// Request targets and static params are built once per VU, not per request
+const CSRF_URL = `${BASE_URL}/sanctum/csrf-cookie`;
+const VERIFY_URL = `${BASE_URL}/api/auth/verify`;
+
+const CSRF_PARAMS = {
+  responseType: 'none', // only status and cookies are needed
+  tags: { name: 'csrf_token' },
+};
+
+const VERIFY_PARAMS = {
+  headers: {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+  },
+  tags: { name: 'verification' },
+};
 
 // Load test options - simulates Slice A user flow under load
 export const options = {
-  stages: [
+  ...loadProfile([
     { duration: '1m', target: 50 },   // Warm up to 50 users
     { duration: '3m', target: 100 },  // Ramp up to 100 users
     { duration: '5m', target: 100 },  // Stay at 100 users (steady state)
     { duration: '2m', target: 200 },  // Spike to 200 users
     { duration: '3m', target: 200 },  // Maintain spike
     { duration: '2m', target: 0 },    // Ramp down
-  ],
+  ], 200),
+  ...CLIENT_OPTIONS,
   thresholds: {
     'http_req_duration': ['p(95)<500'],        // 95% of requests < 500ms
     'http_req_duration{name:registration}': ['p(95)<800'], // Registration < 800ms
@@ -42,9 +70,7 @@ export default function () {
     const startTime = Date.now();
 
     // Step 1: Get CSRF token
-    const csrfRes = http.get(`${BASE_URL}/sanctum/csrf-cookie`, {
-      tags: { name: 'csrf_token' },
-    });
+    const csrfRes = http.get(CSRF_URL, CSRF_PARAMS);
 
     check(csrfRes, {
       'CSRF token retrieved': (r) => r.status === 204,
@@ -60,7 +86,7 @@ export default function () {
     });
 
     const registerRes = http.post(
-      `${BASE_URL}/api/auth/register`,
+      REGISTER_URL,
       registerPayload,
       {
         headers: {
@@ -72,16 +98,11 @@ export default function () {
       }
     );
 
+    const registerBody = parseJson(registerRes);
     const registerSuccess = check(registerRes, {
       'registration status is 201': (r) => r.status === 201,
-      'response contains user data': (r) => {
-        try {
-          const body = JSON.parse(r.body);
-          return body.user && body.user.email === email;
-        } catch (e) {
-          return false;
-        }
-      },
+      'response contains user data': () =>
+        Boolean(registerBody && registerBody.user && registerBody.user.email === email),
       'response time < 800ms': (r) => r.timings.duration < 800,
     });
 
@@ -98,30 +119,18 @@ export default function () {
     // Step 3: Simulate email verification
     // In real scenario, token would come from email
     // For load testing, we'll simulate token retrieval
-    const verificationToken = JSON.parse(registerRes.body).verification_token || 'simulated-token';
+    const verificationToken = registerBody.verification_token || 'simulated-token';
 
     const verifyRes = http.post(
-      `${BASE_URL}/api/auth/verify`,
+      VERIFY_URL,
       JSON.stringify({ token: verificationToken }),
-      {
-        headers: {
-          'Content-Type': 'application/json',
-          'Accept': 'application/json',
-        },
-        tags: { name: 'verification' },
-      }
+      VERIFY_PARAMS
     );
 
+    const verifyBody = parseJson(verifyRes);
     const verifySuccess = check(verifyRes, {
       'verification status is 200': (r) => r.status === 200,
-      'user received 100 points': (r) => {
-        try {
-          const body = JSON.parse(r.body);
-          return body.points === 100;
-        } catch (e) {
-          return false;
-        }
-      },
+      'user received 100 points': () => Boolean(verifyBody && verifyBody.points === 100),
       'verification time < 300ms': (r) => r.timings.duration < 300,
     });
 
@@ -137,11 +146,11 @@ export default function () {
 
     // Step 4: Check points history
     const pointsRes = http.get(
-      `${BASE_URL}/api/gamification/points/history`,
+      POINTS_HISTORY_URL,
       {
         headers: {
           'Accept': 'application/json',
-          'Authorization': `Bearer ${JSON.parse(verifyRes.body).token}`,
+          'Authorization': `Bearer ${verifyBody.token}`,
         },
         tags: { name: 'points_history' },
       }
@@ -167,7 +176,7 @@ export default function () {
   });
 
   // Think time between iterations
-  sleep(Math.random() * 3 + 2); // 2-5 seconds
+  thinkTime(2, 5); // 2-5 seconds
 }
 
 // Setup function - runs once before test
@@ -175,12 +184,12 @@ export function setup() {
   console.log('🚀 Starting Slice A Load Test');
   console.log(`Target: ${BASE_URL}`);
   console.log('Scenario: Registration → Verification → Points Award');
+  if (ARRIVAL_RATE) {
+    console.log(`Pacing: ${ARRIVAL_RATE} iterations/s for ${ARRIVAL_DURATION}`);
+  }
 
   // Health check
-  const healthRes = http.get(`${BASE_URL}/api/health`);
-  if (healthRes.status !== 200) {
-    throw new Error('Health check failed - API is not ready');
-  }
+  checkHealth();
 
   return { timestamp: new Date().toISOString() };
 }
@@ -194,7 +203,7 @@ export function teardown(data) {
 // Handle summary - custom report formatting
 export function handleSummary(data) {
   return {
-    'tests/Performance/reports/slice-a-load-test-summary.json': JSON.stringify(data, null, 2),
+    [`${REPORT_DIR}/slice-a-load-test-summary.json`]: JSON.stringify(data), // compact; pipe through jq to read
     'stdout': textSummary(data, { indent: ' ', enableColors: true }),
   };
 }
@@ -213,7 +222,9 @@ ${indent}
 ${indent}HTTP Performance:
 ${indent}  Requests: ${data.metrics.http_reqs.values.count}
 ${indent}  Duration (p95): ${data.metrics.http_req_duration.values['p(95)']}ms
+${indent}  Duration (p99): ${data.metrics.http_req_duration.values['p(99)']}ms
 ${indent}  Failed Rate: ${(data.metrics.http_req_failed.values.rate * 100).toFixed(2)}%
+${indent}  Connect Time (avg): ${data.metrics.http_req_connecting.values.avg.toFixed(2)}ms (near 0 when keep-alive connections are reused)
 ${indent}
 ${indent}Custom Metrics:
 ${indent}  Successful Registrations: ${data.metrics.successful_registrations.values.count}
@@ -3,6 +3,19 @@ import { check, sleep, group } from 'k6';
 import { Rate, Trend, Counter } from 'k6/metrics';
 import { SharedArray } from 'k6/data';
 import encoding from 'k6/encoding';
+import {
+  BASE_URL,
+  REPORT_DIR,
+  REGISTER_URL,
+  POINTS_HISTORY_URL,
+  ARRIVAL_RATE,
+  ARRIVAL_DURATION,
+  CLIENT_OPTIONS,
+  loadProfile,
+  thinkTime,
+  parseJson,
+  checkHealth,
+} from './common.js';
 
 // Custom metrics
 const errorRate = new Rate('errors');
@@ -11,22 +24,46 @@ const ocrDuration = new Trend('ocr_duration');
 const approvalDuration = new Trend('approval_duration');
 const successfulUploads = new Counter('successful_uploads');
 
-// Configuration
-const BASE_URL = __ENV.BASE_URL || 'https://dev.onboarding.local';
+// Request targets and static params are built once per VU, not per request
+const LOGIN_URL = `${BASE_URL}/api/auth/login`;
+const UPLOAD_URL = `${BASE_URL}/api/documents/upload`;
+const DOCUMENTS_URL = `${BASE_URL}/api/documents`;
+const DOCUMENTS_STATUS_URL = `${BASE_URL}/api/documents/status`;
+
+const AUTH_PARAMS = {
+  headers: {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+  },
+  tags: { name: 'auth' },
+};
+
+// Document types picked uniformly per upload
+const DOCUMENT_TYPES = ['rg', 'cpf', 'proof_of_address'];
 
 // Test image data (1x1 PNG base64 for testing)
 const TEST_IMAGE = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==';
 
+// Upload bodies only vary by document type, so serialize them once per VU
+const UPLOAD_PAYLOADS = DOCUMENT_TYPES.map((type) => JSON.stringify({
+  type: type,
+  file: `data:image/png;base64,${TEST_IMAGE}`,
+}));
+
+// Login/registration bodies are fixed per VU; built on first authenticate()
+let credentialPayloads = null;
+
 // Load test options - simulates Slice B document upload under load
 export const options = {
-  stages: [
+  ...loadProfile([
     { duration: '1m', target: 30 },   // Warm up to 30 users
     { duration: '3m', target: 50 },   // Ramp up to 50 users
     { duration: '5m', target: 50 },   // Stay at 50 users (steady state)
     { duration: '2m', target: 100 },  // Spike to 100 users
     { duration: '3m', target: 100 },  // Maintain spike
     { duration: '2m', target: 0 },    // Ramp down
-  ],
+  ], 100),
+  ...CLIENT_OPTIONS,
   thresholds: {
     'http_req_duration': ['p(95)<1000'],       // 95% of requests < 1s
     'http_req_duration{name:upload}': ['p(95)<2000'], // Upload < 2s
@@ -49,37 +86,29 @@ export default function () {
   group('Slice B - Document Upload Flow', () => {
     const startTime = Date.now();
 
-    // Step 1: Upload document
-    const documentType = ['rg', 'cpf', 'proof_of_address'][Math.floor(Math.random() * 3)];
+    // Token-bearing headers are shared by every request in this iteration
+    const authHeaders = {
+      'Accept': 'application/json',
+      'Authorization': `Bearer ${authToken}`,
+    };
 
-    const uploadPayload = JSON.stringify({
-      type: documentType,
-      file: `data:image/png;base64,${TEST_IMAGE}`,
-    });
+    // Step 1: Upload document
+    const uploadPayload = UPLOAD_PAYLOADS[Math.floor(Math.random() * UPLOAD_PAYLOADS.length)];
 
     const uploadRes = http.post(
-      `${BASE_URL}/api/documents/upload`,
+      UPLOAD_URL,
       uploadPayload,
       {
-        headers: {
-          'Content-Type': 'application/json',
-          'Accept': 'application/json',
-          'Authorization': `Bearer ${authToken}`,
-        },
+        headers: { 'Content-Type': 'application/json', ...authHeaders },
         tags: { name: 'upload' },
       }
     );
 
+    const uploadBody = parseJson(uploadRes);
     const uploadSuccess = check(uploadRes, {
       'upload status is 201': (r) => r.status === 201,
-      'response contains document ID': (r) => {
-        try {
-          const body = JSON.parse(r.body);
-          return body.document && body.document.id;
-        } catch (e) {
-          return false;
-        }
-      },
+      'response contains document ID': () =>
+        Boolean(uploadBody && uploadBody.document && uploadBody.document.id),
       'upload time < 2s': (r) => r.timings.duration < 2000,
     });
 
@@ -88,7 +117,7 @@ export default function () {
       return;
     }
 
-    const documentId = JSON.parse(uploadRes.body).document.id;
+    const documentId = uploadBody.document.id;
     const uploadTime = Date.now() - startTime;
     uploadDuration.add(uploadTime);
 
@@ -98,18 +127,14 @@ export default function () {
     let ocrComplete = false;
     let attempts = 0;
     const maxAttempts = 10;
+    const documentStatusUrl = `${DOCUMENTS_URL}/${documentId}/status`;
+    const ocrParams = {
+      headers: authHeaders,
+      tags: { name: 'ocr' },
+    };
 
     while (!ocrComplete && attempts < maxAttempts) {
-      const statusRes = http.get(
-        `${BASE_URL}/api/documents/${documentId}/status`,
-        {
-          headers: {
-            'Accept': 'application/json',
-            'Authorization': `Bearer ${authToken}`,
-          },
-          tags: { name: 'ocr' },
-        }
-      );
+      const statusRes = http.get(documentStatusUrl, ocrParams);
 
       check(statusRes, {
         'status check successful': (r) => r.status === 200,
@@ -140,12 +165,9 @@ export default function () {
 
     // Step 3: Check document status (simulating approval)
     const finalStatusRes = http.get(
-      `${BASE_URL}/api/documents/status`,
+      DOCUMENTS_STATUS_URL,
       {
-        headers: {
-          'Accept': 'application/json',
-          'Authorization': `Bearer ${authToken}`,
-        },
+        headers: authHeaders,
         tags: { name: 'status' },
       }
     );
@@ -166,12 +188,10 @@ export default function () {
 
     // Step 4: Check points balance (should increase after approval)
     const pointsRes = http.get(
-      `${BASE_URL}/api/gamification/points/history`,
+      POINTS_HISTORY_URL,
       {
-        headers: {
-          'Accept': 'application/json',
-          'Authorization': `Bearer ${authToken}`,
-        },
+        headers: authHeaders,
+        responseType: 'none', // only the status is checked
         tags: { name: 'points' },
       }
     );
@@ -187,28 +207,33 @@ export default function () {
   });
 
   // Think time between iterations
-  sleep(Math.random() * 5 + 3); // 3-8 seconds
+  thinkTime(3, 8); // 3-8 seconds
 }
 
 // Authentication helper
 function authenticate() {
-  const email = `loadtest-${__VU}@example.com`;
-  const password = 'LoadTest123!@#';
+  if (credentialPayloads === null) {
+    const email = `loadtest-${__VU}@example.com`;
+    const password = 'LoadTest123!@#';
+
+    credentialPayloads = {
+      login: JSON.stringify({
+        email: email,
+        password: password,
+      }),
+      register: JSON.stringify({
+        email: email,
+        password: password,
+        password_confirmation: password,
+      }),
+    };
+  }
 
   // Try to login first
   const loginRes = http.post(
-    `${BASE_URL}/api/auth/login`,
-    JSON.stringify({
-      email: email,
-      password: password,
-    }),
-    {
-      headers: {
-        'Content-Type': 'application/json',
-        'Accept': 'application/json',
-      },
-      tags: { name: 'auth' },
-    }
+    LOGIN_URL,
+    credentialPayloads.login,
+    AUTH_PARAMS
   );
 
   if (loginRes.status === 200) {
@@ -221,19 +246,9 @@ function authenticate() {
 
   // If login fails, register new user
   const registerRes = http.post(
-    `${BASE_URL}/api/auth/register`,
-    JSON.stringify({
-      email: email,
-      password: password,
-      password_confirmation: password,
-    }),
-    {
-      headers: {
-        'Content-Type': 'application/json',
-        'Accept': 'application/json',
-      },
-      tags: { name: 'auth' },
-    }
+    REGISTER_URL,
+    credentialPayloads.register,
+    AUTH_PARAMS
   );
 
   if (registerRes.status === 201) {
@@ -252,12 +267,12 @@ export function setup() {
   console.log('🚀 Starting Slice B Load Test');
   console.log(`Target: ${BASE_URL}`);
   console.log('Scenario: Document Upload → OCR Processing → Approval');
-
-  const healthRes = http.get(`${BASE_URL}/api/health`);
-  if (healthRes.status !== 200) {
-    throw new Error('Health check failed - API is not ready');
+  if (ARRIVAL_RATE) {
+    console.log(`Pacing: ${ARRIVAL_RATE} iterations/s for ${ARRIVAL_DURATION}`);
   }
 
+  checkHealth();
+
   return { timestamp: new Date().toISOString() };
 }
 
@@ -270,7 +285,7 @@ export function teardown(data) {
 // Handle summary
 export function handleSummary(data) {
   return {
-    'tests/Performance/reports/slice-b-load-test-summary.json': JSON.stringify(data, null, 2),
+    [`${REPORT_DIR}/slice-b-load-test-summary.json`]: JSON.stringify(data), // compact; pipe through jq to read
     'stdout': textSummary(data),
   };
 }
@@ -286,7 +301,9 @@ VUs: ${data.metrics.vus.values.value}
 HTTP Performance:
   Requests: ${data.metrics.http_reqs.values.count}
   Duration (p95): ${data.metrics.http_req_duration.values['p(95)']}ms
+  Duration (p99): ${data.metrics.http_req_duration.values['p(99)']}ms
   Failed Rate: ${(data.metrics.http_req_failed.values.rate * 100).toFixed(2)}%
+  Connect Time (avg): ${data.metrics.http_req_connecting.values.avg.toFixed(2)}ms (near 0 when keep-alive connections are reused)
 
 Custom Metrics:
   Successful Uploads: ${data.metrics.successful_uploads.values.count}